@@ -4,15 +4,23 @@ Webhook API endpoints for handling reservation events.
 This module provides FastAPI router with endpoints for processing webhook events
 related to resource provisioning and deprovisioning.
 """
-from typing import Optional, List, Union # Added Union
+from typing import Any, Callable, Dict, Optional, List, Set, Tuple, Union # Added Union
 from datetime import datetime # Added datetime
+import asyncio
+import concurrent.futures
+import functools
+import itertools
+import logging
 import uuid
 
-from fastapi import APIRouter, Request, Header, HTTPException, status
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Request, Header, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter, ValidationError
 
 from . import config, models
-from .services import security, kubernetes, notification
+from .services import security, kubernetes, notification, network
 
 logger = config.logger
 router = APIRouter()
@@ -22,49 +30,282 @@ EVENT_START = 'EVENT_START'
 EVENT_END = 'EVENT_END'
 EVENT_DELETED = 'EVENT_DELETED' # Added EVENT_DELETED
 
+# Provisioning settings resolved once at import
+_PROVISION_IMAGE = config.PROVISION_IMAGE
+_PROVISION_CHECKSUM = config.PROVISION_CHECKSUM
+_PROVISION_CHECKSUM_TYPE = config.PROVISION_CHECKSUM_TYPE
+_PROVISIONING_TIMEOUT = config.PROVISIONING_TIMEOUT
+_DEPROVISION_TARGET = config.DEPROVISION_IMAGE or None
 
-async def _verify_webhook_signature(request: Request, signature: Optional[str]) -> bytes:
+# Maximum number of raw body bytes included in request logs
+RAW_PAYLOAD_SNIPPET_LENGTH = 200
+
+# Maximum accepted webhook body size; larger requests are rejected with 413
+MAX_WEBHOOK_BYTES = config.MAX_WEBHOOK_BYTES
+
+# Response message templates, keyed by whether a user id is known
+_BATCH_SUCCESS_TEMPLATES = {
+    True: "Batch %s initiated for %d events for user %s.",
+    False: "Batch %s initiated for %d events.",
+}
+_DELETED_DEPROVISION_TEMPLATE = "Deprovisioning initiated for resource '%s' due to active reservation deletion."
+_DELETED_INACTIVE_TEMPLATE = "No deprovision action taken for resource '%s' as reservation is not currently active."
+_NO_ACTION_TEMPLATE = "No action needed for event type '%s'."
+
+# Liveness probes hit /healthz constantly, so its response is built once and reused
+_HEALTH_RESPONSE_BODY = b'{"status":"ok"}'
+_HEALTH_RESPONSE = Response(content=_HEALTH_RESPONSE_BODY, media_type="application/json")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib json module."""
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+# Validator for the tagged webhook payload union, built once at import
+_payload_adapter = TypeAdapter(models.KnownWebhookPayload)
+# Shape-based fallback for bodies that do not match a handled event type
+_fallback_payload_adapter = TypeAdapter(models.AnyWebhookPayload)
+
+# Signature verifier shared across requests and with the notification service (None when no secret is configured)
+_webhook_security = security.get_webhook_security(config.WEBHOOK_SECRET) if config.WEBHOOK_SECRET else None
+
+# Recently verified (signature, body fingerprint) pairs; lets retried deliveries skip the HMAC
+_verified_signatures = security.VerifiedSignatureCache(maxsize=4096, ttl=60.0)
+
+# Limits concurrent blocking Kubernetes work to avoid API-server throttling; bound to the
+# event loop it is first used on, so it is created per application lifespan
+_k8s_semaphore: Optional[asyncio.Semaphore] = None
+
+# Dedicated pool for blocking event handlers, isolated from the server's default threadpool;
+# an executor cannot be restarted after shutdown, so it is also created per lifespan
+k8s_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+
+def start_event_workers() -> None:
+    """Create the event handler thread pool and concurrency limit for the running event loop."""
+    global k8s_executor, _k8s_semaphore
+    if k8s_executor is None:
+        k8s_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=config.K8S_POOL_SIZE,
+            thread_name_prefix="k8s"
+        )
+    _k8s_semaphore = asyncio.Semaphore(config.K8S_MAX_CONCURRENCY)
+
+
+def stop_event_workers() -> None:
+    """Release the event handler thread pool; start_event_workers creates a new one."""
+    global k8s_executor, _k8s_semaphore
+    if k8s_executor is not None:
+        k8s_executor.shutdown(wait=False)
+    k8s_executor = None
+    _k8s_semaphore = None
+
+
+def _raise_payload_too_large() -> None:
+    """Reject a webhook whose body exceeds MAX_WEBHOOK_BYTES."""
+    logger.warning("Webhook body exceeds the %d byte limit.", MAX_WEBHOOK_BYTES)
+    raise HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail="Webhook payload too large"
+    )
+
+
+async def _read_verified_body(request: Request, signature: Optional[str]) -> bytes:
     """
-    Verify webhook signature and return raw payload.
+    Read the request body and verify its webhook signature.
+    
+    When a secret is configured the body is fingerprinted with BLAKE2b while
+    it is streamed in; byte-identical retries of a recently verified request
+    are accepted from the cache and only new bodies go through the HMAC.
+    Requests that can never be accepted (missing or wrong-length signature,
+    oversized body) are rejected before the body is read.
     
     Args:
         request: FastAPI request object
         signature: Webhook signature header
         
     Returns:
-        Raw request body as bytes
+        Raw request body
         
     Raises:
-        HTTPException: If signature verification fails
+        HTTPException: If the body is too large or signature verification fails
     """
-    payload_raw = await request.body()
+    if _webhook_security is not None and not signature:
+        logger.warning("Missing X-Webhook-Signature header.")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Missing webhook signature"
+        )
+    if _webhook_security is not None and not security.has_signature_length(signature):
+        logger.warning("Malformed X-Webhook-Signature header length.")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid webhook signature"
+        )
     
-    # Use the WebhookSecurity class for signature verification
-    webhook_secret_value = config.WEBHOOK_SECRET
-    if webhook_secret_value:
-        sec_service = security.WebhookSecurity(webhook_secret_value)
-        if not sec_service.verify_signature(payload_raw, signature):
-            logger.warning("Webhook signature verification failed.")
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, # Changed to 403
-                detail="Invalid webhook signature"
-            )
-        logger.info("Webhook signature verified successfully.")
-    else:
-        logger.warning("Webhook secret not configured. Skipping signature verification.")
-        # Allow requests if no secret is configured, or raise error based on policy
-        # For now, allowing, consistent with previous direct call to security.verify_signature behavior
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > MAX_WEBHOOK_BYTES:
+        _raise_payload_too_large()
+    
+    fingerprint = _verified_signatures.new_fingerprint() if _webhook_security is not None else None
+    chunks: List[bytes] = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        # Content-Length may be absent (chunked encoding), so also bound what is actually read
+        if received > MAX_WEBHOOK_BYTES:
+            _raise_payload_too_large()
+        if chunk:
+            chunks.append(chunk)
+            if fingerprint is not None:
+                fingerprint.update(chunk)
+    
+    # Bodies usually arrive in a single chunk, which is used as-is without copying
+    payload_raw = chunks[0] if len(chunks) == 1 else b"".join(chunks)
     
+    # No secret configured: verification is disabled (AppConfig warns once at startup)
+    if fingerprint is None:
+        return payload_raw
+    
+    cache_key = (signature, fingerprint.digest())
+    if cache_key in _verified_signatures:
+        logger.info("Webhook signature matches a recently verified request.")
+        return payload_raw
+    
+    if not _webhook_security.verify_signature(payload_raw, signature):
+        logger.warning("Webhook signature verification failed.")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, # Changed to 403
+            detail="Invalid webhook signature"
+        )
+    _verified_signatures.add(cache_key)
+    logger.info("Webhook signature verified successfully.")
     return payload_raw
 
 
-def _create_batch_success_response(action: str, count: int, user_id: Optional[str]) -> JSONResponse:
-    """Create a standardized success response for batch operations."""
-    user_str = f" for user {user_id}" if user_id else ""
-    message = f"Batch {action} initiated for {count} events{user_str}."
+# Union tags of models.AnyWebhookPayload; they prefix error locations but are not body fields
+_PAYLOAD_TAGS = frozenset({"batch", "single"})
+
+
+def _format_validation_errors(error: ValidationError) -> List[Dict[str, Any]]:
+    """
+    Format payload validation errors the way FastAPI reports request body errors.
+    
+    Args:
+        error: Validation error raised by the payload adapter
+        
+    Returns:
+        JSON-compatible error list with locations rooted at "body"
+    """
+    errors = error.errors(include_url=False)
+    for err in errors:
+        loc = err["loc"]
+        if loc and loc[0] in _PAYLOAD_TAGS:
+            loc = loc[1:]
+        err["loc"] = ("body", *loc)
+    return jsonable_encoder(errors)
+
+
+def _parse_webhook_payload(payload_raw: bytes) -> Union[models.WebhookPayload, models.EventWebhookPayload]:
+    """
+    Validate the raw request body directly into a payload model.
+    
+    Handled event types are dispatched on the eventType key in a single pass.
+    Anything else (unhandled event types, invalid bodies) is re-validated by
+    shape, so unknown event types still parse and errors keep their format.
+    
+    Args:
+        payload_raw: Raw request body as bytes
+        
+    Returns:
+        Parsed batch or EVENT_DELETED payload
+        
+    Raises:
+        HTTPException: If the body does not match the selected payload model
+    """
+    try:
+        return _payload_adapter.validate_json(payload_raw)
+    except ValidationError:
+        pass
+    
+    try:
+        return _fallback_payload_adapter.validate_json(payload_raw)
+    except ValidationError as e:
+        logger.warning("Webhook payload validation failed: %s errors.", e.error_count())
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=_format_validation_errors(e)
+        )
+
+
+async def _run_event_handler(handler: Callable[..., bool], *args: Any) -> bool:
+    """
+    Run a blocking event handler on the K8s executor, bounded by the K8s semaphore.
+    
+    Args:
+        handler: Synchronous event handler returning True on success
+        *args: Positional arguments forwarded to the handler
+        
+    Returns:
+        Result of the handler
+    """
+    if _k8s_semaphore is None:
+        # Application served without its lifespan (e.g. a TestClient used outside a with block)
+        start_event_workers()
+    async with _k8s_semaphore:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(k8s_executor, functools.partial(handler, *args))
+
+
+async def _run_event_handlers(handler: Callable[..., bool], args_list: List[tuple]) -> List[bool]:
+    """
+    Run an event handler concurrently for each argument tuple.
+    
+    Exceptions raised by a single handler are logged and reported as a failure
+    for that event, so one bad event does not abort the rest of the batch.
+    
+    Args:
+        handler: Synchronous event handler returning True on success
+        args_list: One tuple of positional arguments per event
+        
+    Returns:
+        List of per-event results, in the same order as args_list
+    """
+    results = await asyncio.gather(
+        *(_run_event_handler(handler, *args) for args in args_list),
+        return_exceptions=True
+    )
+    outcomes = []
+    for args, result in zip(args_list, results):
+        if isinstance(result, BaseException):
+            logger.error("Unexpected error while handling event for resource '%s': %s", args[0], result)
+            outcomes.append(False)
+        else:
+            outcomes.append(result)
+    return outcomes
+
+
+def _success_response(message: str) -> ORJSONResponse:
+    """
+    Create a success response matching models.WebhookResponse.
+    
+    The content is built by this module, so it is rendered directly
+    without validating it through the response model.
+    """
     response_data = {"status": "success", "message": message}
-    logger.debug(f"Response data: {response_data}")
-    return JSONResponse(response_data)
+    logger.debug("Response data: %r", response_data)
+    return ORJSONResponse(response_data)
+
+
+def _create_batch_success_response(action: str, count: int, user_id: Optional[str]) -> ORJSONResponse:
+    """Create a standardized success response for batch operations."""
+    if user_id:
+        message = _BATCH_SUCCESS_TEMPLATES[True] % (action, count, user_id)
+    else:
+        message = _BATCH_SUCCESS_TEMPLATES[False] % (action, count)
+    return _success_response(message)
 
 def _post_batch_provision_actions(events: List[models.Event], user_info: dict, active_resources: Optional[List[models.Event]] = None) -> None:
     """
@@ -72,45 +313,178 @@ def _post_batch_provision_actions(events: List[models.Event], user_info: dict, a
     This function configures network switch settings to create VLANs and 
     assign server ports for the batch of provisioned resources.
     """
-    logger.info(f"Executing post-batch provision actions for user {user_info.get('username')}, {len(events)} new resources.")
+    logger.info("Executing post-batch provision actions for user %s, %s new resources.", user_info.get('username'), len(events))
     
     # Log the resources that were just provisioned
     for event in events:
-        logger.info(f"  Post-provision check for NEW resource: {event.resource_name} (Event ID: {event.event_id})")
+        logger.info("  Post-provision check for NEW resource: %s (Event ID: %s)", event.resource_name, event.event_id)
     
     # Log active resources if present (resources the user already had)
     if active_resources and len(active_resources) > 0:
-        logger.info(f"  User also has {len(active_resources)} existing active resources:")
+        logger.info("  User also has %s existing active resources:", len(active_resources))
         for active_resource in active_resources:
-            logger.info(f"    - ACTIVE resource: {active_resource.resource_name} (Event ID: {active_resource.event_id})")
+            logger.info("    - ACTIVE resource: %s (Event ID: %s)", active_resource.resource_name, active_resource.event_id)
     
     # Configure network switch for the batch of provisioned servers
     if config.NETWORK_CONFIG_ENABLED:
         try:
-            from app.services.network import get_switch_manager
-            
-            # Extract resource names from events
-            resource_names = [event.resource_name for event in events]
-            for active_resource in active_resources:
-                resource_names.append(active_resource.resource_name)
+            # Extract resource names from new and already active events in one pass
+            resource_names: List[str] = [
+                event.resource_name for event in itertools.chain(events, active_resources or ())
+            ]
 
             # Configure network switch
-            switch_manager = get_switch_manager()
+            switch_manager = network.get_switch_manager()
             success = switch_manager.configure_batch_network(resource_names, user_info)
             
             if success:
-                logger.info(f"Successfully configured network switch for batch of {len(events)} resources")
+                logger.info("Successfully configured network switch for batch of %s resources", len(events))
             else:
-                logger.error(f"Failed to configure network switch for batch of {len(events)} resources")
+                logger.error("Failed to configure network switch for batch of %s resources", len(events))
                 
         except Exception as e:
-            logger.error(f"Error during network configuration: {e}")
+            logger.error("Error during network configuration: %s", e)
             # Don't raise the exception to avoid breaking the provisioning workflow
     else:
         logger.info("Network configuration is disabled (NETWORK_CONFIG_ENABLED=false)")
     
     logger.info("Post-batch provision actions completed.")
 
+class IngressCoalescer:
+    """
+    Merges post-batch switch configuration of EVENT_START webhooks arriving close together.
+    
+    Submitted batches are buffered until COALESCE_WINDOW_MS has elapsed since
+    the first one or COALESCE_MAX_BATCH batches are queued. Batches of the same
+    user are then merged into a single _post_batch_provision_actions call, so a
+    burst of webhooks opens one switch session per user instead of one per
+    webhook. Batches without a user ID are never merged.
+    """
+    
+    def __init__(self, window_ms: int, max_batch: int):
+        """
+        Initialize the coalescer.
+        
+        Args:
+            window_ms: Buffering window in milliseconds (0 disables coalescing)
+            max_batch: Maximum number of batches merged in one window
+        """
+        self.window = window_ms / 1000
+        self.max_batch = max(max_batch, 1)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def running(self) -> bool:
+        """Whether the drain task is accepting submissions."""
+        return self._task is not None and not self._task.done()
+    
+    def start(self) -> None:
+        """Start the drain task on the running event loop."""
+        if self.window <= 0 or self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Process any buffered batches and stop the drain task."""
+        if not self.running:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+    
+    def submit(self, events: List[models.Event], user_info: dict, active_resources: Optional[List[models.Event]]) -> None:
+        """
+        Queue post-batch provision actions for coalescing.
+        
+        Args:
+            events: Successfully provisioned events of the batch
+            user_info: User information dictionary
+            active_resources: Resources the user already had active
+        """
+        self._queue.put_nowait((events, user_info, active_resources))
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            pending = [item]
+            deadline = loop.time() + self.window
+            while len(pending) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                pending.append(item)
+            await self._flush(pending)
+    
+    async def _flush(self, pending: List[tuple]) -> None:
+        groups: Dict[Any, List[tuple]] = {}
+        for item in pending:
+            user_id = item[1].get("userId")
+            groups.setdefault(user_id if user_id is not None else id(item), []).append(item)
+        
+        for items in groups.values():
+            events: Dict[str, models.Event] = {}
+            active: Dict[str, models.Event] = {}
+            for batch_events, _, batch_active in items:
+                events.update((event.resource_name, event) for event in batch_events)
+                active.update((event.resource_name, event) for event in batch_active or ())
+            for resource_name in events:
+                active.pop(resource_name, None)
+            
+            if len(items) > 1:
+                logger.info("Coalesced %d EVENT_START batches into one switch configuration.", len(items))
+            try:
+                await asyncio.to_thread(
+                    _post_batch_provision_actions,
+                    list(events.values()), items[-1][1], list(active.values()) or None
+                )
+            except Exception as e:
+                logger.error("Coalesced post-batch provision actions failed: %s", e)
+
+
+# Shared coalescer, started and stopped by the application lifespan
+ingress_coalescer = IngressCoalescer(config.COALESCE_WINDOW_MS, config.COALESCE_MAX_BATCH)
+
+# Strong references to tasks detached from a request, so they are not garbage-collected mid-run
+_detached_tasks: Set[asyncio.Task] = set()
+
+
+def run_detached(background_tasks: BackgroundTasks) -> None:
+    """
+    Run background tasks on the event loop without holding up the current response.
+    
+    Args:
+        background_tasks: Tasks to run
+    """
+    task = asyncio.create_task(background_tasks())
+    _detached_tasks.add(task)
+    task.add_done_callback(_detached_tasks.discard)
+
+
+async def wait_detached_tasks() -> None:
+    """Wait for tasks started by run_detached to finish."""
+    if _detached_tasks:
+        await asyncio.gather(*_detached_tasks, return_exceptions=True)
+
+
+# Webhook log sender specialised for provisioning starts
+_send_start_log = functools.partial(notification.send_webhook_log, event_type=EVENT_START, retry_count=0)
+_PROVISION_STARTED_MESSAGE = "Provisioning initiated successfully"
+_PROVISION_START_FAILED_MESSAGE = "Failed to start provisioning"
+
+
 def _handle_provision_event(
     resource_name: str, 
     ssh_public_key: Optional[str], 
@@ -122,75 +496,57 @@ def _handle_provision_event(
     Handle provisioning event for a single resource. Returns True on success.
     """
     logger.info(
-        f"[{EVENT_START}] Processing event for resource '{resource_name}' (Event ID: {event_id}). "
-        f"Attempting to provision with image '{config.PROVISION_IMAGE}'."
+        "[%s] Processing event for resource '%s' (Event ID: %s). "
+        "Attempting to provision with image '%s'.",
+        EVENT_START, resource_name, event_id, _PROVISION_IMAGE
     )
     
     # Provision the BareMetalHost with asynchronous monitoring
     success = kubernetes.patch_baremetalhost(
         bmh_name=resource_name,
-        image_url=config.PROVISION_IMAGE,
+        image_url=_PROVISION_IMAGE,
         ssh_key=ssh_public_key,
-        checksum=config.PROVISION_CHECKSUM,
-        checksum_type=config.PROVISION_CHECKSUM_TYPE,
+        checksum=_PROVISION_CHECKSUM,
+        checksum_type=_PROVISION_CHECKSUM_TYPE,
         webhook_id=webhook_id,
         user_id=user_id,
         event_id=event_id,
-        timeout=config.PROVISIONING_TIMEOUT
+        timeout=_PROVISIONING_TIMEOUT
     )
     
-    if not success:
-        # Send immediate notification and webhook log if the provisioning failed to start
-        if webhook_id and user_id:
+    if webhook_id and user_id:
+        if not success:
+            # Send immediate notification if the provisioning failed to start
             notification_sent = notification.send_provisioning_notification(
                 webhook_id=webhook_id,
                 user_id=user_id,
                 resource_name=resource_name,
                 success=False,
-                error_message="Failed to start provisioning",
+                error_message=_PROVISION_START_FAILED_MESSAGE,
                 event_id=event_id
             )
             if not notification_sent:
-                logger.warning(f"Failed to send notification for resource '{resource_name}'")
-            
-            # Send webhook log for the failed provisioning attempt
-            webhook_log_sent = notification.send_webhook_log(
-                webhook_id=webhook_id,
-                event_type=EVENT_START,
-                success=False,
-                status_code=500,
-                response_message="Failed to start provisioning",
-                retry_count=0,
-                resource_name=resource_name,
-                user_id=user_id,
-                error_message="Failed to start provisioning",
-                event_id=event_id
-            )
-            if not webhook_log_sent:
-                logger.warning(f"Failed to send webhook log for resource '{resource_name}'")
+                logger.warning("Failed to send notification for resource '%s'", resource_name)
+        
+        # Single webhook log call covering both the successful and the failed start
+        webhook_log_sent = _send_start_log(
+            webhook_id=webhook_id,
+            success=success,
+            status_code=200 if success else 500,
+            response_message=_PROVISION_STARTED_MESSAGE if success else _PROVISION_START_FAILED_MESSAGE,
+            resource_name=resource_name,
+            user_id=user_id,
+            error_message=None if success else _PROVISION_START_FAILED_MESSAGE,
+            event_id=event_id
+        )
+        if not webhook_log_sent:
+            logger.warning("Failed to send webhook log for resource '%s'", resource_name)
     
     if success:
-        # Send webhook log for successful provisioning initiation
-        if webhook_id and user_id:
-            webhook_log_sent = notification.send_webhook_log(
-                webhook_id=webhook_id,
-                event_type=EVENT_START,
-                success=True,
-                status_code=200,
-                response_message="Provisioning initiated successfully",
-                retry_count=0,
-                resource_name=resource_name,
-                user_id=user_id,
-                error_message=None,
-                event_id=event_id
-            )
-            if not webhook_log_sent:
-                logger.warning(f"Failed to send webhook log for resource '{resource_name}'")
-        
-        logger.info(f"[{EVENT_START}] Successfully initiated provisioning for resource '{resource_name}' (Event ID: {event_id}). Monitoring in background.")
+        logger.info("[%s] Successfully initiated provisioning for resource '%s' (Event ID: %s). Monitoring in background.", EVENT_START, resource_name, event_id)
         return True
     else:
-        logger.error(f"[{EVENT_START}] Failed to start provisioning for resource '{resource_name}' (Event ID: {event_id}).")
+        logger.error("[%s] Failed to start provisioning for resource '%s' (Event ID: %s).", EVENT_START, resource_name, event_id)
         return False
 
 
@@ -203,11 +559,12 @@ def _handle_deprovision_event(
     """
     Handle deprovisioning event for a single resource. Returns True on success.
     """
-    deprovision_target = config.DEPROVISION_IMAGE if config.DEPROVISION_IMAGE else None
+    deprovision_target = _DEPROVISION_TARGET
     # Modified logger to be more generic for use by EVENT_DELETED
     logger.info(
-        f"Processing deprovision event for resource '{resource_name}' (Event ID: {event_id}). "
-        f"Attempting to deprovision with target '{deprovision_target}'."
+        "Processing deprovision event for resource '%s' (Event ID: %s). "
+        "Attempting to deprovision with target '%s'.",
+        resource_name, event_id, deprovision_target
     )
     
     success = kubernetes.patch_baremetalhost(resource_name, deprovision_target)
@@ -215,22 +572,20 @@ def _handle_deprovision_event(
     # Restore network configuration to default VLAN if network config is enabled
     if success and config.NETWORK_CONFIG_ENABLED:
         try:
-            from app.services.network import get_switch_manager
-            
-            logger.info(f"Restoring network configuration for resource '{resource_name}' to default VLAN 10")
+            logger.info("Restoring network configuration for resource '%s' to default VLAN 10", resource_name)
             
             # Restore the server port to default VLAN 10
-            switch_manager = get_switch_manager()
+            switch_manager = network.get_switch_manager()
             network_success = switch_manager.restore_port_to_default_vlan(resource_name)
             
             if network_success:
-                logger.info(f"Successfully restored network configuration for resource '{resource_name}' to default VLAN 10")
+                logger.info("Successfully restored network configuration for resource '%s' to default VLAN 10", resource_name)
             else:
-                logger.error(f"Failed to restore network configuration for resource '{resource_name}' to default VLAN 10")
+                logger.error("Failed to restore network configuration for resource '%s' to default VLAN 10", resource_name)
                 # Don't fail the deprovisioning if network restoration fails
                 
         except Exception as e:
-            logger.error(f"Error during network restoration for resource '{resource_name}': {e}")
+            logger.error("Error during network restoration for resource '%s': %s", resource_name, e)
             # Don't raise the exception to avoid breaking the deprovisioning workflow
     elif success:
         logger.info("Network configuration is disabled (NETWORK_CONFIG_ENABLED=false), skipping network restoration")
@@ -250,53 +605,208 @@ def _handle_deprovision_event(
             event_id=event_id
         )
         if not webhook_log_sent:
-            logger.warning(f"Failed to send webhook log for resource '{resource_name}'")
+            logger.warning("Failed to send webhook log for resource '%s'", resource_name)
     
     if success:
-        logger.info(f"Successfully initiated deprovisioning for resource '{resource_name}' (Event ID: {event_id}).")
+        logger.info("Successfully initiated deprovisioning for resource '%s' (Event ID: %s).", resource_name, event_id)
         return True
     else:
-        logger.error(f"Failed deprovisioning for resource '{resource_name}' (Event ID: {event_id}).")
+        logger.error("Failed deprovisioning for resource '%s' (Event ID: %s).", resource_name, event_id)
         return False
 
-@router.post("/webhook")
+async def _handle_deleted_event(payload: models.EventWebhookPayload) -> ORJSONResponse:
+    """
+    Handle an EVENT_DELETED payload.
+    
+    The resource is deprovisioned only if the deleted reservation is active at
+    the payload timestamp; otherwise no action is taken.
+    
+    Args:
+        payload: Validated EVENT_DELETED payload
+        
+    Returns:
+        Success response describing the action taken
+        
+    Raises:
+        HTTPException: If deprovisioning an active reservation fails
+    """
+    resource_name = payload.data.resource.name
+    now = payload.timestamp # Use timestamp from the payload
+    
+    # Pydantic v2 automatically handles ISO 8601 strings to offset-aware datetimes
+    reservation_start = payload.data.start
+    reservation_end = payload.data.end
+
+    logger.debug("Current time (UTC): %s, Reservation Start: %s, Reservation End: %s", now, reservation_start, reservation_end)
+
+    # Integer epoch-microsecond comparison; the models convert the parsed timestamps once at validation
+    if not payload.data.is_active_at(payload.timestamp_us):
+        logger.info(
+            "Reservation for resource '%s' is not currently active. No deprovision action taken for EVENT_DELETED. "
+            "Start: %s, End: %s, Now: %s",
+            resource_name, reservation_start, reservation_end, now
+        )
+        return _success_response(_DELETED_INACTIVE_TEMPLATE % resource_name)
+    
+    logger.info("Reservation for resource '%s' is currently active. Initiating deprovision.", resource_name)
+    if not await _run_event_handler(
+        _handle_deprovision_event,
+        resource_name,
+        str(payload.data.id),
+        payload.webhook_id,
+        payload.data.keycloak_id
+    ):
+        logger.error("Failed to initiate deprovisioning for resource '%s' for EVENT_DELETED.", resource_name)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to deprovision resource '{resource_name}' after EVENT_DELETED."
+        )
+    
+    logger.info("Successfully initiated deprovisioning for resource '%s' due to EVENT_DELETED.", resource_name)
+    return _success_response(_DELETED_DEPROVISION_TEMPLATE % resource_name)
+
+
+def _collect_failures(events: List[models.Event], results: List[bool], action: str) -> List[Tuple[str, str, str]]:
+    """
+    Build the (event_id, resource_name, action) tuples for events whose handler failed.
+    
+    Args:
+        events: Events in handler submission order
+        results: Handler results aligned with events
+        action: Action name reported for the failures
+        
+    Returns:
+        Failure tuples, empty when every handler succeeded
+    """
+    if all(results):
+        return []
+    return [
+        (event.event_id, event.resource_name, action)
+        for event, success in zip(events, results) if not success
+    ]
+
+
+async def _handle_start_batch(
+    payload: models.WebhookPayload,
+    user_info: dict,
+    background_tasks: BackgroundTasks
+) -> Tuple[int, List[Tuple[str, str, str]]]:
+    """
+    Provision every resource of an EVENT_START batch.
+    
+    Args:
+        payload: Validated batch payload
+        user_info: User information used for post-batch actions
+        background_tasks: Tasks run after the response is sent
+        
+    Returns:
+        Number of successfully processed events and the (event_id, resource_name, action) failures
+    """
+    ssh_public_key = payload.ssh_public_key
+    webhook_id = payload.webhook_id
+    user_id = payload.user_id or "unknown"
+    results = await _run_event_handlers(_handle_provision_event, [
+        (event.resource_name, ssh_public_key, webhook_id, user_id, event.event_id)
+        for event in payload.events
+    ])
+    
+    events = payload.events
+    successful_provision_events = list(itertools.compress(events, results))
+    failed_event_details = _collect_failures(events, results, "provision")
+    
+    if successful_provision_events:
+        if ingress_coalescer.running:
+            # Merged with other EVENT_START batches of the same user arriving in the same window
+            ingress_coalescer.submit(successful_provision_events, user_info, payload.active_resources)
+        else:
+            # Switch configuration runs over SSH; run it in the threadpool after the response is sent
+            background_tasks.add_task(
+                _post_batch_provision_actions,
+                successful_provision_events, user_info, payload.active_resources
+            )
+    
+    return len(successful_provision_events), failed_event_details
+
+
+async def _handle_end_batch(
+    payload: models.WebhookPayload,
+    user_info: dict,
+    background_tasks: BackgroundTasks
+) -> Tuple[int, List[Tuple[str, str, str]]]:
+    """
+    Deprovision every resource of an EVENT_END batch.
+    
+    Args:
+        payload: Validated batch payload
+        user_info: User information (unused, kept for a uniform handler signature)
+        background_tasks: Tasks run after the response is sent (unused)
+        
+    Returns:
+        Number of successfully processed events and the (event_id, resource_name, action) failures
+    """
+    webhook_id = payload.webhook_id
+    user_id = payload.user_id
+    results = await _run_event_handlers(_handle_deprovision_event, [
+        (event.resource_name, event.event_id, webhook_id, user_id)
+        for event in payload.events
+    ])
+    
+    return results.count(True), _collect_failures(payload.events, results, "deprovision")
+
+
+# Event type -> handler tables used by handle_webhook
+_BATCH_HANDLERS = {
+    EVENT_START: _handle_start_batch,
+    EVENT_END: _handle_end_batch,
+}
+_EVENT_HANDLERS = {
+    EVENT_DELETED: _handle_deleted_event,
+}
+
+
+@router.post("/webhook", response_model=models.WebhookResponse)
 async def handle_webhook(
-    payload: Union[models.WebhookPayload, models.EventWebhookPayload], # Updated payload type
     request: Request, 
+    background_tasks: BackgroundTasks,
     x_webhook_signature: Optional[str] = Header(None)
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Handle incoming webhook events for resource provisioning/deprovisioning.
     Always expects a list of events in the payload for EVENT_START and EVENT_END.
     Expects a single data object for EVENT_DELETED.
     """
-    logger.info(f"Received webhook request. Attempting to parse payload.")
+    logger.info("Received webhook request. Attempting to parse payload.")
     
-    raw_payload = await _verify_webhook_signature(request, x_webhook_signature)
+    raw_payload = await _read_verified_body(request, x_webhook_signature)
+    payload = _parse_webhook_payload(raw_payload)
     
     # Log based on the payload structure
     if isinstance(payload, models.WebhookPayload):
         active_resources_count = len(payload.active_resources) if payload.active_resources else 0
-        logger.info(
-            f"Processing webhook. Event Type: '{payload.event_type}', "
-            f"User: '{payload.username}', Event Count: {payload.event_count}, "
-            f"Active Resources Count: {active_resources_count}."
-            f" Raw payload snippet: {raw_payload}"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Processing webhook. Event Type: '%s', User: '%s', Event Count: %s, "
+                "Active Resources Count: %s. Raw payload snippet: %r",
+                payload.event_type, payload.username, payload.event_count,
+                active_resources_count, raw_payload[:RAW_PAYLOAD_SNIPPET_LENGTH]
+            )
 
         # Log active resources if present
-        if payload.active_resources and len(payload.active_resources) > 0:
-            logger.info(f"User '{payload.username}' has {len(payload.active_resources)} active resources:")
-            for active_resource in payload.active_resources:
+        if payload.active_resources:
+            if logger.isEnabledFor(logging.INFO):
                 logger.info(
-                    f"  - Active Resource: '{active_resource.resource_name}' ({active_resource.resource_type}) "
-                    f"Event: '{active_resource.event_title}' (until {active_resource.event_end})"
+                    "User '%s' has %d active resources (name, type, event title, until): %s",
+                    payload.username, len(payload.active_resources),
+                    [
+                        (r.resource_name, r.resource_type, r.event_title, r.event_end.isoformat())
+                        for r in payload.active_resources
+                    ]
                 )
         else:
-            logger.info(f"User '{payload.username}' has no active resources at this time.")
+            logger.info("User '%s' has no active resources at this time.", payload.username)
             
         processed_events_count = 0
-        failed_event_details = []
+        failed_event_details: List[Tuple[str, str, str]] = []
         
         user_info = {
             "userId": payload.user_id,
@@ -309,116 +819,55 @@ async def handle_webhook(
             logger.warning("Received payload with no events listed.")
             return _create_batch_success_response(payload.event_type.lower(), 0, payload.user_id)
 
-        if payload.event_type == EVENT_START:
-            
-            successful_provision_events = []
-            for event in payload.events:
-                if _handle_provision_event(
-                    event.resource_name, 
-                    payload.ssh_public_key, 
-                    payload.webhook_id,
-                    payload.user_id or "unknown",
-                    event.event_id
-                ):
-                    processed_events_count += 1
-                    successful_provision_events.append(event)
-                else:
-                    failed_event_details.append({"event_id": event.event_id, "resource_name": event.resource_name, "action": "provision"})
-            
-            if successful_provision_events:
-                 _post_batch_provision_actions(successful_provision_events, user_info, payload.active_resources)
-
-        elif payload.event_type == EVENT_END:
-            successful_deprovision_events = []
-            for event in payload.events:
-                if _handle_deprovision_event(
-                    event.resource_name, 
-                    event.event_id,
-                    payload.webhook_id,
-                    payload.user_id
-                ):
-                    processed_events_count += 1
-                    successful_deprovision_events.append(event)
-                else:
-                    failed_event_details.append({"event_id": event.event_id, "resource_name": event.resource_name, "action": "deprovision"})
-        # Note: Unknown event type for WebhookPayload is handled further down
+        batch_handler = _BATCH_HANDLERS.get(payload.event_type)
+        if batch_handler is not None:
+            processed_events_count, failed_event_details = await batch_handler(payload, user_info, background_tasks)
+        # Unknown event types for WebhookPayload are reported below as processed with no failures
         
         if failed_event_details:
-            logger.error(f"Webhook processing for user {payload.username} (Event Type: {payload.event_type}) encountered {len(failed_event_details)} failures out of {payload.event_count} events.")
+            logger.error("Webhook processing for user %s (Event Type: %s) encountered %s failures out of %s events.", payload.username, payload.event_type, len(failed_event_details), payload.event_count)
+            failures = [
+                {"event_id": event_id, "resource_name": resource_name, "action": action}
+                for event_id, resource_name, action in failed_event_details
+            ]
+            # Background tasks are dropped for error responses; still configure the successful resources
+            run_detached(background_tasks)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Processing for event type '{payload.event_type}' failed for {len(failed_event_details)} out of {payload.event_count} events. Failures: {failed_event_details}"
+                detail=f"Processing for event type '{payload.event_type}' failed for {len(failed_event_details)} out of {payload.event_count} events. Failures: {failures}"
             )
         
         # If all events (if any) were processed successfully
         return _create_batch_success_response(payload.event_type.lower(), processed_events_count, payload.user_id)
 
     elif isinstance(payload, models.EventWebhookPayload):
-        logger.info(
-            f"Processing webhook. Event Type: '{payload.event_type}', "
-            f"Webhook ID: '{payload.webhook_id}', Resource Name: '{payload.data.resource.name}'."
-            f" Raw payload snippet: {raw_payload}"
-        )
-        if payload.event_type == EVENT_DELETED:
-            now = payload.timestamp # Use timestamp from the payload
-            
-            # Ensure start and end times are offset-aware for comparison with offset-aware 'now'
-            # Pydantic v2 automatically handles ISO 8601 strings to offset-aware datetimes
-            reservation_start = payload.data.start
-            reservation_end = payload.data.end
-
-            logger.debug(f"Current time (UTC): {now}, Reservation Start: {reservation_start}, Reservation End: {reservation_end}")
-
-            if reservation_start <= now < reservation_end:
-                logger.info(f"Reservation for resource '{payload.data.resource.name}' is currently active. Initiating deprovision.")
-                if _handle_deprovision_event(
-                    payload.data.resource.name, 
-                    event_id=str(payload.data.id),
-                    webhook_id=payload.webhook_id,
-                    user_id=payload.data.keycloakId if payload.data else None
-                ):
-                    logger.info(f"Successfully initiated deprovisioning for resource '{payload.data.resource.name}' due to EVENT_DELETED.")
-                    return JSONResponse({
-                        "status": "success", 
-                        "message": f"Deprovisioning initiated for resource '{payload.data.resource.name}' due to active reservation deletion."
-                    })
-                else:
-                    logger.error(f"Failed to initiate deprovisioning for resource '{payload.data.resource.name}' for EVENT_DELETED.")
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f"Failed to deprovision resource '{payload.data.resource.name}' after EVENT_DELETED."
-                    )
-            else:
-                logger.info(f"Reservation for resource '{payload.data.resource.name}' is not currently active. No deprovision action taken for EVENT_DELETED. Start: {reservation_start}, End: {reservation_end}, Now: {now}")
-                return JSONResponse({
-                    "status": "success", # Or "no_action_needed"
-                    "message": f"No deprovision action taken for resource '{payload.data.resource.name}' as reservation is not currently active."
-                })
-        else:
-            return JSONResponse({
-                "status": "success",
-                "message": f"No action needed for event type '{payload.event_type}'."
-            })
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Processing webhook. Event Type: '%s', Webhook ID: '%s', Resource Name: '%s'. "
+                "Raw payload snippet: %r",
+                payload.event_type, payload.webhook_id, payload.data.resource.name,
+                raw_payload[:RAW_PAYLOAD_SNIPPET_LENGTH]
+            )
+        event_handler = _EVENT_HANDLERS.get(payload.event_type)
+        if event_handler is None:
+            return _success_response(_NO_ACTION_TEMPLATE % payload.event_type)
+        return await event_handler(payload)
     else:
         # If event type is not recognized, return success with no action needed
         event_type_to_log = payload.event_type if hasattr(payload, 'event_type') else "unknown"
         username_to_log = payload.username if isinstance(payload, models.WebhookPayload) and hasattr(payload, 'username') else "N/A"
         
-        logger.info(f"Received event type '{event_type_to_log}' for user {username_to_log}. No action configured for this event type.")
-        return JSONResponse({
-            "status": "success",
-            "message": f"No action needed for event type '{event_type_to_log}'."
-        })
+        logger.info("Received event type '%s' for user %s. No action configured for this event type.", event_type_to_log, username_to_log)
+        return _success_response(_NO_ACTION_TEMPLATE % event_type_to_log)
 
 
 @router.get("/healthz")
-def health_check() -> dict:
+def health_check() -> Response:
     """
     Health check endpoint.
     
     Returns:
-        Dict containing health status
+        Precomputed JSON response containing health status
     """
-    response_data = {"status": "ok"}
-    logger.debug(f"Health check response: {response_data}")
-    return response_data
+    logger.debug("Health check response: %s", _HEALTH_RESPONSE_BODY)
+    return _HEALTH_RESPONSE
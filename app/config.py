@@ -8,6 +8,7 @@ import logging
 import os
 from typing import Optional
 
+from kubernetes import client as kube_client
 from kubernetes import config as kube_config
 
 
@@ -61,10 +62,13 @@ class KubernetesConfig:
     """Manages Kubernetes configuration."""
     
     @staticmethod
-    def load_config() -> None:
+    def load_config(pool_maxsize: Optional[int] = None) -> None:
         """
         Load Kubernetes configuration (in-cluster or local kubeconfig).
         
+        Args:
+            pool_maxsize: Minimum number of keep-alive connections per API client pool
+            
         Raises:
             ConfigurationError: If no valid Kubernetes configuration is found
         """
@@ -79,6 +83,27 @@ class KubernetesConfig:
                 error_msg = "Could not load any Kubernetes configuration."
                 logger.error(error_msg)
                 raise ConfigurationError(error_msg)
+        
+        if pool_maxsize:
+            KubernetesConfig._ensure_pool_size(pool_maxsize)
+    
+    @staticmethod
+    def _ensure_pool_size(pool_maxsize: int) -> None:
+        """
+        Grow the API client connection pool so concurrent calls reuse connections.
+        
+        Concurrent BareMetalHost patches share one urllib3 pool per API client;
+        if the pool is smaller than the concurrency, extra connections are
+        discarded after each call and re-established (TCP + TLS) on the next one.
+        
+        Args:
+            pool_maxsize: Minimum number of keep-alive connections to keep
+        """
+        kube_configuration = kube_client.Configuration.get_default_copy()
+        if kube_configuration.connection_pool_maxsize < pool_maxsize:
+            kube_configuration.connection_pool_maxsize = pool_maxsize
+            kube_client.Configuration.set_default(kube_configuration)
+            logger.info(f"Kubernetes API connection pool size set to {pool_maxsize}.")
 
 
 class AppConfig:
@@ -103,15 +128,22 @@ class AppConfig:
         self.switch_username = os.environ.get("SWITCH_USERNAME")
         self.switch_password = os.environ.get("SWITCH_PASSWORD")
         self.network_config_enabled = os.environ.get("NETWORK_CONFIG_ENABLED", "true").lower() == "true"
+        self.coalesce_window_ms = int(os.environ.get("COALESCE_WINDOW_MS", "50"))
+        self.coalesce_max_batch = int(os.environ.get("COALESCE_MAX_BATCH", "32"))
+        self.switch_idle_timeout = int(os.environ.get("SWITCH_IDLE_TIMEOUT", "300"))  # 5 minutes
         
         # Security configuration
         self.webhook_secret = os.environ.get("WEBHOOK_SECRET")
+        self.max_webhook_bytes = int(os.environ.get("MAX_WEBHOOK_BYTES", str(1024 * 1024)))  # 1 MiB
         
         # Server configuration
         self.port = int(os.environ.get("PORT", "8080"))
+        self.web_concurrency = int(os.environ.get("WEB_CONCURRENCY", "1"))
         
         # Provisioning configuration
         self.provisioning_timeout = int(os.environ.get("PROVISIONING_TIMEOUT", "600"))  # 10 minutes
+        self.k8s_max_concurrency = int(os.environ.get("K8S_MAX_CONCURRENCY", "10"))
+        self.k8s_pool_size = int(os.environ.get("K8S_POOL_SIZE", str(self.k8s_max_concurrency)))
         
         # Notification configuration
         self.notification_endpoint = os.environ.get("NOTIFICATION_ENDPOINT")
@@ -146,13 +178,7 @@ class AppConfig:
 logger = LoggingConfig.setup_logger()
 config = AppConfig()
 
-# Configure uvicorn access logger to filter out healthz requests if enabled
-if config.disable_healthz_logs:
-    uvicorn_access_logger = logging.getLogger("uvicorn.access")
-    uvicorn_access_logger.addFilter(HealthzFilter())
-
-# Initialize Kubernetes configuration
-KubernetesConfig.load_config()
+# Kubernetes configuration is loaded by the application lifespan (see load_kubernetes_config)
 
 # Export commonly used configuration values for backward compatibility
 K8S_NAMESPACE = config.k8s_namespace
@@ -164,14 +190,31 @@ PROVISION_CHECKSUM = config.provision_checksum
 PROVISION_CHECKSUM_TYPE = config.provision_checksum_type
 DEPROVISION_IMAGE = config.deprovision_image
 WEBHOOK_SECRET = config.webhook_secret
+MAX_WEBHOOK_BYTES = config.max_webhook_bytes
 PORT = config.port
+WEB_CONCURRENCY = config.web_concurrency
 SWITCH_HOST = config.switch_host
 SWITCH_USERNAME = config.switch_username
 SWITCH_PASSWORD = config.switch_password
 NETWORK_CONFIG_ENABLED = config.network_config_enabled
+COALESCE_WINDOW_MS = config.coalesce_window_ms
+COALESCE_MAX_BATCH = config.coalesce_max_batch
+SWITCH_IDLE_TIMEOUT = config.switch_idle_timeout
 DISABLE_HEALTHZ_LOGS = config.disable_healthz_logs
 PROVISIONING_TIMEOUT = config.provisioning_timeout
+K8S_MAX_CONCURRENCY = config.k8s_max_concurrency
+K8S_POOL_SIZE = config.k8s_pool_size
 NOTIFICATION_ENDPOINT = config.notification_endpoint
 NOTIFICATION_TIMEOUT = config.notification_timeout
 WEBHOOK_LOG_ENDPOINT = config.webhook_log_endpoint
 WEBHOOK_LOG_TIMEOUT = config.webhook_log_timeout
+
+
+def load_kubernetes_config() -> None:
+    """
+    Load the Kubernetes configuration with the connection pool sized for K8S_MAX_CONCURRENCY.
+    
+    Raises:
+        ConfigurationError: If no valid Kubernetes configuration is found
+    """
+    KubernetesConfig.load_config(pool_maxsize=config.k8s_max_concurrency)
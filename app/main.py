@@ -4,11 +4,69 @@ Main application entry point.
 This module sets up the FastAPI application and configures the server
 for handling webhook events related to resource reservation management.
 """
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from fastapi.utils import is_body_allowed_for_status_code
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from . import config
+from . import api, config
+from .config import HealthzFilter
 from .api import router
+from .services import kubernetes, network
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Manage application startup and shutdown.
+    
+    Args:
+        app: FastAPI application instance
+    """
+    # Installed here so that every worker process filters its own access log
+    if config.DISABLE_HEALTHZ_LOGS:
+        logging.getLogger("uvicorn.access").addFilter(HealthzFilter())
+    # Load Kubernetes config per worker and open API connections before the first webhook
+    config.load_kubernetes_config()
+    await asyncio.to_thread(kubernetes.prewarm)
+    api.start_event_workers()
+    api.ingress_coalescer.start()
+    yield
+    # Finish switch configuration still buffered by the coalescer
+    await api.ingress_coalescer.stop()
+    # Finish switch configuration detached from failed batch requests
+    await api.wait_detached_tasks()
+    # Release the worker threads used for Kubernetes event handling
+    api.stop_event_workers()
+    # Close switch SSH sessions kept open for reuse
+    await asyncio.to_thread(network.close_switch_connections)
+
+
+async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> Response:
+    """
+    Render HTTP errors the same way as FastAPI's default handler, encoded with orjson.
+    
+    Args:
+        request: Request that raised the exception
+        exc: Raised HTTP exception
+        
+    Returns:
+        orjson-encoded error response, or an empty response for statuses that allow no body
+    """
+    headers = getattr(exc, "headers", None)
+    if not is_body_allowed_for_status_code(exc.status_code):
+        return Response(status_code=exc.status_code, headers=headers)
+    return api.ORJSONResponse(
+        {"detail": exc.detail},
+        status_code=exc.status_code,
+        headers=headers,
+    )
 
 
 def create_app() -> FastAPI:
@@ -25,8 +83,13 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
+        lifespan=lifespan,
+        default_response_class=api.ORJSONResponse,
     )
     
+    # Serialize error responses with orjson as well
+    app.add_exception_handler(StarletteHTTPException, http_exception_handler)
+    
     # Add router to the FastAPI application
     app.include_router(router)
     
@@ -39,19 +102,17 @@ app = create_app()
 
 def main() -> None:
     """Run the application server."""
-    # Configure logging to filter healthz logs if enabled
-    if config.DISABLE_HEALTHZ_LOGS:
-        import logging
-        from .config import HealthzFilter
-        uvicorn_access_logger = logging.getLogger("uvicorn.access")
-        uvicorn_access_logger.addFilter(HealthzFilter())
-    
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",  # Bind to all interfaces
         port=config.PORT,
         reload=False,
-        log_level="info"
+        log_level="info",
+        loop="uvloop",  # Provided by uvicorn[standard]
+        http="httptools",  # Provided by uvicorn[standard]
+        workers=config.WEB_CONCURRENCY,
+        backlog=2048,
+        timeout_keep_alive=30
     )
 
 
@@ -4,14 +4,32 @@ Pydantic models for webhook payload validation.
 This module defines the data models used for validating incoming webhook payloads
 and ensuring type safety throughout the application.
 """
-from datetime import datetime
-from typing import Optional, List  # Union removed
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Any, Literal, Optional, List, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Discriminator, Field, PrivateAttr, Tag
+
+
+# Models are validated through module-level TypeAdapters built once at import
+# (see app.api); their own standalone validators are only built if used directly.
+_DEFERRED_CONFIG = ConfigDict(defer_build=True)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_epoch_us(value: datetime) -> int:
+    """Convert a datetime to integer UTC epoch microseconds; naive values are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
 
 
 class Event(BaseModel):
     """Model for individual event details within a batch."""
+    model_config = _DEFERRED_CONFIG
+    
     event_id: str = Field(..., alias='eventId', description="Unique identifier for the event")
     event_title: Optional[str] = Field(None, alias='eventTitle', description="Title of the reservation event")
     event_description: Optional[str] = Field(None, alias='eventDescription', description="Description of the event")
@@ -31,6 +49,8 @@ class WebhookPayload(BaseModel):
     Model for webhook event payload.
     It always expects a list of events, even for a single event.
     """
+    model_config = _DEFERRED_CONFIG
+    
     webhook_id: str = Field(..., alias='webhookId', description="Unique identifier for the webhook call")
     event_type: str = Field(..., alias='eventType', description="Type of the event (e.g., EVENT_START, EVENT_END)")
     timestamp: datetime = Field(..., description="Timestamp when the batch event occurred")
@@ -45,21 +65,104 @@ class WebhookPayload(BaseModel):
 
 class EventResourceInfo(BaseModel):
     """Model for resource information within EVENT_DELETED data."""
+    model_config = _DEFERRED_CONFIG
+    
     name: str = Field(..., description="Name of the resource to be deprovisioned")
 
 
 class EventData(BaseModel):
     """Model for the 'data' field in an EVENT_DELETED payload."""
+    model_config = _DEFERRED_CONFIG
+    
     id: int = Field(..., description="Unique identifier for the deletion event data")
     start: datetime = Field(..., description="Original start time of the reservation")
     end: datetime = Field(..., description="Original end time of the reservation")
     resource: EventResourceInfo = Field(..., description="Details of the resource associated with the event")
     keycloak_id: Optional[str] = Field(None, alias='keycloakId', description="Keycloak ID of the user")
+    
+    # Reservation window as epoch microseconds, computed once after validation
+    _start_us: int = PrivateAttr(0)
+    _end_us: int = PrivateAttr(0)
+    
+    def model_post_init(self, __context: Any) -> None:
+        self._start_us = _to_epoch_us(self.start)
+        self._end_us = _to_epoch_us(self.end)
+    
+    def is_active_at(self, timestamp_us: int) -> bool:
+        """
+        Check whether the reservation window contains a point in time.
+        
+        Args:
+            timestamp_us: Point in time as UTC epoch microseconds
+            
+        Returns:
+            True if start <= timestamp < end
+        """
+        return self._start_us <= timestamp_us < self._end_us
 
 
 class EventWebhookPayload(BaseModel):
     """Model for EVENT_DELETED webhook payload."""
+    model_config = _DEFERRED_CONFIG
+    
     event_type: str = Field(..., alias='eventType', description="Type of the event, should be EVENT_DELETED")
     timestamp: datetime = Field(..., description="Timestamp when the event occurred")
     webhook_id: str = Field(..., alias='webhookId', description="Unique identifier for the webhook call")
     data: EventData = Field(..., description="Detailed data for the EVENT_DELETED event")
+    
+    _timestamp_us: int = PrivateAttr(0)
+    
+    def model_post_init(self, __context: Any) -> None:
+        self._timestamp_us = _to_epoch_us(self.timestamp)
+    
+    @property
+    def timestamp_us(self) -> int:
+        """Event timestamp as UTC epoch microseconds."""
+        return self._timestamp_us
+
+
+class WebhookResponse(BaseModel):
+    """Model for the response returned by the webhook endpoint."""
+    status: str = Field(..., description="Outcome of the webhook processing (e.g., success)")
+    message: str = Field(..., description="Human-readable description of the action taken")
+
+
+def _get_payload_tag(value: Any) -> str:
+    """
+    Select the payload model for an incoming webhook body.
+    
+    Batch payloads carry an 'events' list while EVENT_DELETED payloads carry
+    a single 'data' object, so the tag is resolved from a single key lookup.
+    """
+    if isinstance(value, dict):
+        return "single" if "data" in value and "events" not in value else "batch"
+    return "single" if isinstance(value, EventWebhookPayload) else "batch"
+
+
+class BatchEventWebhookPayload(WebhookPayload):
+    """WebhookPayload narrowed to the batch event types handled by the service."""
+    event_type: Literal["EVENT_START", "EVENT_END"] = Field(..., alias='eventType', description="Type of the batch event")
+
+
+class DeletedEventWebhookPayload(EventWebhookPayload):
+    """EventWebhookPayload narrowed to EVENT_DELETED."""
+    event_type: Literal["EVENT_DELETED"] = Field(..., alias='eventType', description="Type of the event, always EVENT_DELETED")
+
+
+# Union of the handled event types, discriminated on the eventType key so
+# validate_json selects the model without first building a Python dict
+KnownWebhookPayload = Annotated[
+    Union[BatchEventWebhookPayload, DeletedEventWebhookPayload],
+    Field(discriminator="event_type"),
+]
+
+
+# Tagged union of all accepted webhook payloads, selected by shape; also
+# accepts event types with no handler
+AnyWebhookPayload = Annotated[
+    Union[
+        Annotated[WebhookPayload, Tag("batch")],
+        Annotated[EventWebhookPayload, Tag("single")],
+    ],
+    Discriminator(_get_payload_tag),
+]
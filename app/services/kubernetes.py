@@ -6,10 +6,12 @@ to manage BareMetalHost custom resources and related secrets.
 """
 import asyncio
 import base64
+import functools
 import threading
 import time
-from typing import Optional
+from typing import Any, Callable, Optional
 
+import orjson
 import yaml
 from kubernetes import client, watch
 from kubernetes.client.rest import ApiException
@@ -18,6 +20,15 @@ from .. import config
 
 logger = config.logger
 
+# Field manager recorded by server-side apply for the objects we own
+_FIELD_MANAGER = "webhook-client"
+
+# LibYAML-backed emitter when PyYAML was built with it, pure-Python otherwise
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
 # Cloud-config template for user data
 CLOUD_CONFIG_TEMPLATE = {
     "ssh_pwauth": True,
@@ -41,18 +52,115 @@ CLOUD_CONFIG_TEMPLATE = {
 }
 
 
+def _dump_cloud_config(ssh_key: Optional[str]) -> str:
+    """
+    Render the cloud-config YAML for an SSH key with the YAML emitter.
+    
+    Args:
+        ssh_key: SSH public key to authorize for the external user
+        
+    Returns:
+        Cloud-config as YAML string
+    """
+    # Only the "prognose" user gets a new dict with the ssh_key; everything else is shared with the template
+    cloud_config = {
+        **CLOUD_CONFIG_TEMPLATE,
+        "users": [
+            {**user, "ssh_authorized_keys": [ssh_key]} if user["name"] == "prognose" else user
+            for user in CLOUD_CONFIG_TEMPLATE["users"]
+        ]
+    }
+    
+    return "#cloud-config\n" + yaml.dump(cloud_config, Dumper=_YamlDumper, default_flow_style=False)
+
+
+# Cloud-config rendered once around a placeholder key and kept as UTF-8 bytes; only the key is substituted per call
+_SSH_KEY_PLACEHOLDER = "SSH_PUBLIC_KEY_PLACEHOLDER"
+_CLOUD_CONFIG_HEAD, _CLOUD_CONFIG_TAIL = (
+    part.encode('utf-8') for part in _dump_cloud_config(_SSH_KEY_PLACEHOLDER).split(_SSH_KEY_PLACEHOLDER)
+)
+
+
+# Deprovisioning always sends the same body, so it is built once
+_DEPROVISION_PATCH = {
+    "spec": {
+        "image": None,
+        "userData": None
+    }
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _userdata_secret_name(bmh_name: str) -> str:
+    """
+    Get the name of the user data secret for a BareMetalHost.
+    
+    Args:
+        bmh_name: Name of the BareMetalHost
+        
+    Returns:
+        Name of the user data secret
+    """
+    return f"{bmh_name}-userdata"
+
+
 class KubernetesError(Exception):
     """Custom exception for Kubernetes operations."""
     pass
 
 
+# Process-wide API client shared by all managers, so every Kubernetes call reuses one connection pool
+_api_client: Optional[client.ApiClient] = None
+_api_client_lock = threading.Lock()
+
+
+def get_api_client() -> client.ApiClient:
+    """
+    Get the shared Kubernetes ApiClient, creating it on first use.
+    
+    The client is created lazily so that it picks up the configuration
+    (and connection pool size) loaded by the application lifespan.
+    
+    Returns:
+        Shared ApiClient instance
+    """
+    global _api_client
+    if _api_client is None:
+        with _api_client_lock:
+            if _api_client is None:
+                _api_client = client.ApiClient()
+    return _api_client
+
+
 class UserDataSecretManager:
     """Manages user data secrets for BareMetalHost resources."""
     
     def __init__(self, api_client: Optional[client.CoreV1Api] = None):
-        self.api = api_client or client.CoreV1Api()
+        self._api = api_client
+        self._apply_secret_call: Optional[Callable[..., Any]] = None
+    
+    @property
+    def api(self) -> client.CoreV1Api:
+        """CoreV1Api client, created on first use after the Kubernetes config is loaded."""
+        if self._api is None:
+            self._api = client.CoreV1Api(get_api_client())
+        return self._api
     
-    def _generate_cloud_config(self, ssh_key: str) -> str:
+    @property
+    def _apply_secret(self) -> Callable[..., Any]:
+        """Server-side apply call for secrets with the constant arguments bound once."""
+        if self._apply_secret_call is None:
+            self._apply_secret_call = functools.partial(
+                self.api.patch_namespaced_secret,
+                namespace=config.K8S_NAMESPACE,
+                field_manager=_FIELD_MANAGER,
+                force=True,
+                _content_type="application/apply-patch+yaml"
+            )
+        return self._apply_secret_call
+    
+    @staticmethod
+    def _generate_cloud_config(ssh_key: str) -> bytes:
         """
         Generate cloud-config YAML with the provided SSH key.
         
@@ -60,53 +168,56 @@ class UserDataSecretManager:
             ssh_key: SSH public key to include in the cloud-config
             
         Returns:
-            Cloud-config as YAML string
+            Cloud-config as UTF-8 encoded YAML
         """
-        cloud_config = CLOUD_CONFIG_TEMPLATE.copy()
-        # Ensure users list is deep copied if further modifications are needed that could affect the template
-        cloud_config["users"] = [user.copy() for user in CLOUD_CONFIG_TEMPLATE["users"]]
-
-        # Find the "prognose" and add the ssh_key
-        for user in cloud_config["users"]:
-            if user["name"] == "prognose":
-                user["ssh_authorized_keys"] = [ssh_key]
-                break
+        # Printable ASCII keys are written as a JSON string, which is also a valid YAML
+        # double-quoted scalar, into the pre-rendered template
+        if isinstance(ssh_key, str) and ssh_key.isascii() and ssh_key.isprintable():
+            return _CLOUD_CONFIG_HEAD + orjson.dumps(ssh_key) + _CLOUD_CONFIG_TAIL
         
-        return "#cloud-config\n" + yaml.dump(cloud_config, default_flow_style=False)
+        return _dump_cloud_config(ssh_key).encode('utf-8')
     
-    def _encode_cloud_config(self, cloud_config: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _build_userdata(ssh_key: str) -> str:
         """
-        Encode cloud-config to base64.
+        Build the base64 encoded cloud-config user data for an SSH key.
+        
+        The output depends only on the key, so results are memoized and
+        repeat provisions for the same user skip rendering and encoding.
         
         Args:
-            cloud_config: Cloud-config as string
+            ssh_key: SSH public key to include in the cloud-config
             
         Returns:
             Base64 encoded cloud-config
         """
-        return base64.b64encode(cloud_config.encode('utf-8')).decode('utf-8')
+        return base64.b64encode(UserDataSecretManager._generate_cloud_config(ssh_key)).decode('ascii')
     
-    def _create_secret_object(self, secret_name: str, cloud_config_b64: str) -> client.V1Secret:
+    def _create_secret_object(self, secret_name: str, cloud_config_b64: str) -> dict:
         """
-        Create a Kubernetes Secret object.
+        Create a Kubernetes Secret manifest.
+        
+        The manifest is a plain dict so the client sends it as-is instead of
+        building and re-serializing a V1Secret model.
         
         Args:
             secret_name: Name of the secret
             cloud_config_b64: Base64 encoded cloud-config
             
         Returns:
-            V1Secret object
+            Secret manifest dictionary
         """
-        return client.V1Secret(
-            api_version="v1",
-            kind="Secret",
-            metadata=client.V1ObjectMeta(
-                name=secret_name,
-                namespace=config.K8S_NAMESPACE
-            ),
-            type="Opaque",
-            data={"userData": cloud_config_b64}
-        )
+        return {
+            "apiVersion": "v1",
+            "kind": "Secret",
+            "metadata": {
+                "name": secret_name,
+                "namespace": config.K8S_NAMESPACE
+            },
+            "type": "Opaque",
+            "data": {"userData": cloud_config_b64}
+        }
     
     def create_or_update(self, bmh_name: str, ssh_key: str) -> bool:
         """
@@ -119,40 +230,30 @@ class UserDataSecretManager:
         Returns:
             True if successful, False otherwise
         """
-        secret_name = f"{bmh_name}-userdata"
+        secret_name = _userdata_secret_name(bmh_name)
         
         try:
             # Generate and encode cloud-config
-            cloud_config = self._generate_cloud_config(ssh_key)
-            cloud_config_b64 = self._encode_cloud_config(cloud_config)
+            cloud_config_b64 = self._build_userdata(ssh_key)
             
             # Create secret object
             secret = self._create_secret_object(secret_name, cloud_config_b64)
             
-            # Try to create the secret
+            # Server-side apply creates the secret or updates it in a single PATCH
             try:
-                self.api.create_namespaced_secret(namespace=config.K8S_NAMESPACE, body=secret)
-                logger.info(f"Created secret '{secret_name}' in namespace '{config.K8S_NAMESPACE}'.")
+                self._apply_secret(name=secret_name, body=secret)
+                logger.info("Applied secret '%s' in namespace '%s'.", secret_name, config.K8S_NAMESPACE)
                 return True
                 
             except ApiException as e:
-                if e.status == 409:  # Secret already exists, update it
-                    self.api.patch_namespaced_secret(
-                        name=secret_name, 
-                        namespace=config.K8S_NAMESPACE, 
-                        body=secret
-                    )
-                    logger.info(f"Updated existing secret '{secret_name}' in namespace '{config.K8S_NAMESPACE}'.")
-                    return True
-                else:
-                    logger.error(
-                        f"Error creating secret '{secret_name}': {e.reason} "
-                        f"(Status: {e.status}). Body: {e.body}"
-                    )
-                    return False
+                logger.error(
+                    "Error applying secret '%s': %s (Status: %s). Body: %s",
+                    secret_name, e.reason, e.status, e.body
+                )
+                return False
                     
         except Exception as e:
-            logger.error(f"Unexpected error while managing secret '{secret_name}': {str(e)}")
+            logger.error("Unexpected error while managing secret '%s': %s", secret_name, e)
             return False
 
 
@@ -160,9 +261,30 @@ class BareMetalHostManager:
     """Manages BareMetalHost custom resources."""
     
     def __init__(self, api_client: Optional[client.CustomObjectsApi] = None):
-        self.api = api_client or client.CustomObjectsApi()
+        self._api = api_client
+        self._patch_bmh_call: Optional[Callable[..., Any]] = None
         self.secret_manager = UserDataSecretManager()
     
+    @property
+    def api(self) -> client.CustomObjectsApi:
+        """CustomObjectsApi client, created on first use after the Kubernetes config is loaded."""
+        if self._api is None:
+            self._api = client.CustomObjectsApi(get_api_client())
+        return self._api
+    
+    @property
+    def _patch_bmh(self) -> Callable[..., Any]:
+        """BareMetalHost patch call with the constant group/version/namespace/plural bound once."""
+        if self._patch_bmh_call is None:
+            self._patch_bmh_call = functools.partial(
+                self.api.patch_namespaced_custom_object,
+                group=config.BMH_API_GROUP,
+                version=config.BMH_API_VERSION,
+                namespace=config.K8S_NAMESPACE,
+                plural=config.BMH_PLURAL
+            )
+        return self._patch_bmh_call
+    
     def _create_provision_patch(
         self, 
         image_url: str, 
@@ -189,7 +311,7 @@ class BareMetalHostManager:
                     "checksumType": checksum_type
                 },
                 "userData": {
-                    "name": f"{bmh_name}-userdata",
+                    "name": _userdata_secret_name(bmh_name),
                     "namespace": config.K8S_NAMESPACE
                 }
             }
@@ -200,14 +322,9 @@ class BareMetalHostManager:
         Create a patch for deprovisioning a BareMetalHost.
         
         Returns:
-            Patch dictionary for deprovisioning
+            Patch dictionary for deprovisioning (shared, must not be mutated)
         """
-        return {
-            "spec": {
-                "image": None,
-                "userData": None
-            }
-        }
+        return _DEPROVISION_PATCH
     
     def _apply_patch(self, bmh_name: str, patch: dict, operation: str) -> bool:
         """
@@ -223,35 +340,27 @@ class BareMetalHostManager:
         """
         try:
             logger.info(
-                f"Attempting to {operation} BareMetalHost '{bmh_name}' "
-                f"in namespace '{config.K8S_NAMESPACE}'."
+                "Attempting to %s BareMetalHost '%s' in namespace '%s'.",
+                operation, bmh_name, config.K8S_NAMESPACE
             )
+            logger.debug("Patching BareMetalHost '%s' with %s", bmh_name, patch)
             
-            response = self.api.patch_namespaced_custom_object(
-                group=config.BMH_API_GROUP,
-                version=config.BMH_API_VERSION,
-                namespace=config.K8S_NAMESPACE,
-                plural=config.BMH_PLURAL,
-                name=bmh_name,
-                body=patch
-            )
+            response = self._patch_bmh(name=bmh_name, body=patch)
 
-            logger.debug(
-                f"Patch response for BareMetalHost '{bmh_name}': {response}"
-            )
+            logger.debug("Patch response for BareMetalHost '%s': %s", bmh_name, response)
             
-            logger.info(f"Successfully {operation}ed BareMetalHost '{bmh_name}'.")
+            logger.info("Successfully %sed BareMetalHost '%s'.", operation, bmh_name)
             return True
             
         except ApiException as e:
             logger.error(
-                f"Error {operation}ing BareMetalHost '{bmh_name}': {e.reason} "
-                f"(Status: {e.status}). Body: {e.body}"
+                "Error %sing BareMetalHost '%s': %s (Status: %s). Body: %s",
+                operation, bmh_name, e.reason, e.status, e.body
             )
             return False
             
         except Exception as e:
-            logger.error(f"Unexpected error while {operation}ing BareMetalHost '{bmh_name}': {str(e)}")
+            logger.error("Unexpected error while %sing BareMetalHost '%s': %s", operation, bmh_name, e)
             return False
     
     def provision(
@@ -288,7 +397,7 @@ class BareMetalHostManager:
         # Create or update user data secret if SSH key is provided
         if ssh_key:
             if not self.secret_manager.create_or_update(bmh_name, ssh_key):
-                logger.error(f"Failed to create userdata secret for BareMetalHost '{bmh_name}'. Aborting provision.")
+                logger.error("Failed to create userdata secret for BareMetalHost '%s'. Aborting provision.", bmh_name)
                 return False
         
         # Create and apply provision patch
@@ -304,7 +413,7 @@ class BareMetalHostManager:
                 event_id=event_id,
                 timeout=timeout
             )
-            logger.info(f"Started asynchronous monitoring for BareMetalHost '{bmh_name}' provisioning")
+            logger.info("Started asynchronous monitoring for BareMetalHost '%s' provisioning", bmh_name)
         
         return success
     
@@ -358,7 +467,7 @@ class BareMetalHostManager:
                 current_provisioning = current_status.get('provisioning', {})
                 current_state = current_provisioning.get('state', '')
                 
-                logger.debug(f"BareMetalHost '{bmh_name}' initial state: '{current_state}'")
+                logger.debug("BareMetalHost '%s' initial state: '%s'", bmh_name, current_state)
                 
                 # Check if already in final state
                 if current_state == 'provisioned':
@@ -391,7 +500,7 @@ class BareMetalHostManager:
                     provisioning = status.get('provisioning', {})
                     state = provisioning.get('state', '')
                     
-                    logger.debug(f"BareMetalHost '{bmh_name}' watch event: {event_type}, state: '{state}'")
+                    logger.debug("BareMetalHost '%s' watch event: %s, state: '%s'", bmh_name, event_type, state)
                     
                     if state == 'provisioned':
                         logger.info(f"BareMetalHost '{bmh_name}' provisioning completed successfully")
@@ -563,12 +672,12 @@ class ProvisioningMonitor:
             if not notification_sent:
                 logger.warning(f"Failed to send notification for resource '{resource_name}'")
             else:
-                logger.debug(f"Successfully sent notification for resource '{resource_name}' (success: {success})")
+                logger.debug("Successfully sent notification for resource '%s' (success: %s)", resource_name, success)
                 
             if not webhook_log_sent:
                 logger.warning(f"Failed to send webhook log for resource '{resource_name}'")
             else:
-                logger.debug(f"Successfully sent webhook log for resource '{resource_name}' (success: {success})")
+                logger.debug("Successfully sent webhook log for resource '%s' (success: %s)", resource_name, success)
                 
         except Exception as e:
             logger.error(f"Error sending notification/webhook log for resource '{resource_name}': {str(e)}")
@@ -620,5 +729,21 @@ def patch_baremetalhost(
         return _bmh_manager.deprovision(bmh_name)
 
 
+def prewarm() -> None:
+    """
+    Open pooled connections to the Kubernetes API before the first webhook.
+    
+    Creates the shared API client and issues a cheap GET /version through it,
+    so the TLS handshake is not paid by the first request. Failures are
+    logged and otherwise ignored; requests will connect on demand.
+    """
+    try:
+        client.VersionApi(get_api_client()).get_code(_request_timeout=5)
+    except Exception as e:
+        logger.warning("Kubernetes API prewarm failed: %s", e)
+        return
+    logger.info("Kubernetes API connections prewarmed.")
+
+
 # Legacy function alias for backward compatibility
 create_userdata_secret = lambda bmh_name, ssh_key: _bmh_manager.secret_manager.create_or_update(bmh_name, ssh_key)
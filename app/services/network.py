@@ -4,16 +4,60 @@ Network service module for managing switch configurations.
 This module handles network switch operations using netmiko to configure
 VLANs and port assignments for batch-provisioned servers.
 """
+import copy
+import functools
 import hashlib
+import itertools
 import logging
 import os
+import re
+import threading
 import time
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 import yaml
 from netmiko import ConnectHandler, NetmikoTimeoutException, NetmikoAuthenticationException
 
-from app.config import logger
+from app.config import logger, SWITCH_IDLE_TIMEOUT
+
+# LibYAML-backed parser when PyYAML was built with it, pure-Python otherwise
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Parsed (and env-substituted) network configs keyed by (path, mtime)
+_config_cache: Dict[Tuple[str, float], Dict] = {}
+
+# Jinja-style "{{ VAR | default('value') }}" placeholder left unrendered in the config file
+_PLACEHOLDER_DEFAULT = re.compile(r"^\{\{.*\|\s*default\('([^']*)'\)\s*\}\}$")
+
+# Idle switch sessions kept open for reuse, keyed by (host, port, username), with their release time
+_connection_pool: Dict[Tuple[str, int, str], Tuple[ConnectHandler, float]] = {}
+_connection_pool_lock = threading.Lock()
+
+# Serializes switch configuration sessions; event handlers run concurrently, but the
+# switch has few VTY lines and overlapping config saves can fail
+_switch_config_lock = threading.Lock()
+
+def _resolve_setting(env_name: str, raw: str) -> str:
+    """
+    Resolve a switch setting from the environment or the config file value.
+    
+    Args:
+        env_name: Environment variable overriding the setting
+        raw: Value from the config file, possibly an unrendered placeholder
+        
+    Returns:
+        The environment value if set, else the placeholder's default, else the raw value
+    """
+    value = os.environ.get(env_name)
+    if value:
+        return value
+    
+    match = _PLACEHOLDER_DEFAULT.match(raw) if raw.startswith('{{') else None
+    return match.group(1) if match else raw
+
 
 class NetworkConfigurationError(Exception):
     """Raised when there's an error in network configuration."""
@@ -33,11 +77,16 @@ class SwitchManager:
         self.config_path = config_path
         self.config = self._load_config()
         self.logger = logger
+        # Port lookups memoized per set of resource names; bound to this instance's config
+        self._resolve_ports = functools.lru_cache(maxsize=256)(self._resolve_ports_uncached)
         
     def _load_config(self) -> Dict:
         """
         Load network configuration from YAML file.
         
+        The parsed configuration is cached per path and modification time, so
+        new instances only re-read the file after it changes.
+        
         Returns:
             Configuration dictionary
             
@@ -45,41 +94,63 @@ class SwitchManager:
             NetworkConfigurationError: If config file cannot be loaded
         """
         try:
-            with open(self.config_path, 'r') as file:
-                config = yaml.safe_load(file)
+            cache_key = (self.config_path, os.stat(self.config_path).st_mtime)
+            cached = _config_cache.get(cache_key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+            
+            # Binary stream: the parser decodes UTF-8 itself while reading in chunks
+            with open(self.config_path, 'rb') as file:
+                config = yaml.load(file, Loader=_YamlLoader)
                 
             # Replace environment variable placeholders
             switch_config = config['switch']
-            switch_config['host'] = os.environ.get('SWITCH_HOST', switch_config['host'].replace('{{ SWITCH_HOST | default(\'192.168.1.1\') }}', '192.168.1.1'))
-            switch_config['username'] = os.environ.get('SWITCH_USERNAME', switch_config['username'].replace('{{ SWITCH_USERNAME | default(\'admin\') }}', 'admin'))
-            switch_config['password'] = os.environ.get('SWITCH_PASSWORD', switch_config['password'].replace('{{ SWITCH_PASSWORD | default(\'admin\') }}', 'admin'))
+            switch_config['host'] = _resolve_setting('SWITCH_HOST', switch_config['host'])
+            switch_config['username'] = _resolve_setting('SWITCH_USERNAME', switch_config['username'])
+            switch_config['password'] = _resolve_setting('SWITCH_PASSWORD', switch_config['password'])
             
-            return config
+            _config_cache[cache_key] = config
+            return copy.deepcopy(config)
         except FileNotFoundError:
             raise NetworkConfigurationError(f"Network configuration file not found: {self.config_path}")
         except yaml.YAMLError as e:
             raise NetworkConfigurationError(f"Error parsing network configuration: {e}")
     
-    def _get_server_ports(self, resource_names: List[str]) -> Dict[str, int]:
+    def _resolve_ports_uncached(self, resource_names: FrozenSet[str]) -> Tuple[Tuple[str, int], ...]:
         """
-        Get switch port numbers for given resource names.
+        Resolve switch ports for a set of resource names.
+        
+        Missing mappings are logged here, so each unique set warns only once.
         
         Args:
-            resource_names: List of resource names (e.g., ['restart-srv01', 'restart-srv03'])
+            resource_names: Set of resource names
             
         Returns:
-            Dictionary mapping resource names to port numbers
+            (resource name, port number) pairs ordered by port
         """
         server_port_mapping = self.config['server_port_mapping']
-        ports = {}
+        ports = []
         
-        for resource_name in resource_names:
+        for resource_name in sorted(resource_names):
             if resource_name in server_port_mapping:
-                ports[resource_name] = server_port_mapping[resource_name]
+                ports.append((resource_name, server_port_mapping[resource_name]))
             else:
-                self.logger.warning(f"No port mapping found for resource: {resource_name}")
+                self.logger.warning("No port mapping found for resource: %s", resource_name)
                 
-        return ports
+        ports.sort(key=lambda item: item[1])
+        return tuple(ports)
+    
+    def _get_server_ports(self, resource_names: List[str]) -> Dict[str, int]:
+        """
+        Get switch port numbers for given resource names.
+        
+        Args:
+            resource_names: List of resource names (e.g., ['restart-srv01', 'restart-srv03'])
+            
+        Returns:
+            Dictionary mapping resource names to port numbers, ordered by port
+        """
+        return dict(self._resolve_ports(frozenset(resource_names)))
     
     def _generate_vlan_id(self, resource_names: List[str], user_info: Dict) -> int:
         """
@@ -98,8 +169,8 @@ class SwitchManager:
         hash_input = f"{username}:{':'.join(sorted_resources)}"
         
         # Generate hash and convert to a reasonable VLAN ID range
-        hash_value = hashlib.md5(hash_input.encode()).hexdigest()
-        vlan_offset = int(hash_value[:4], 16) % 900  # Limit to 900 to avoid high VLAN IDs
+        hash_value = hashlib.blake2b(hash_input.encode('utf-8'), digest_size=2).digest()
+        vlan_offset = int.from_bytes(hash_value, 'big') % 900  # Limit to 900 to avoid high VLAN IDs
         
         base_vlan_id = self.config['vlan']['base_id']
         vlan_id = base_vlan_id + vlan_offset
@@ -110,9 +181,17 @@ class SwitchManager:
             
         return vlan_id
     
+    def _connection_key(self) -> Tuple[str, int, str]:
+        """Key identifying the switch session in the connection pool."""
+        switch_config = self.config['switch']
+        return (switch_config['host'], switch_config.get('port', 22), switch_config['username'])
+    
     def _connect_to_switch(self) -> ConnectHandler:
         """
-        Establish connection to the network switch.
+        Get a connection to the network switch.
+        
+        An idle pooled session is reused if it has not exceeded SWITCH_IDLE_TIMEOUT
+        and is still alive; otherwise a new connection is established.
         
         Returns:
             Connected netmiko device instance
@@ -120,9 +199,19 @@ class SwitchManager:
         Raises:
             NetworkConfigurationError: If connection fails
         """
+        with _connection_pool_lock:
+            pooled = _connection_pool.pop(self._connection_key(), None)
+        
+        if pooled is not None:
+            device, released_at = pooled
+            if time.monotonic() - released_at < SWITCH_IDLE_TIMEOUT and device.is_alive():
+                self.logger.debug("Reusing connection to switch: %s", self.config['switch']['host'])
+                return device
+            _disconnect(device)
+        
         try:
             device = ConnectHandler(**self.config['switch'])
-            self.logger.info(f"Successfully connected to switch: {self.config['switch']['host']}")
+            self.logger.info("Successfully connected to switch: %s", self.config['switch']['host'])
             return device
         except NetmikoTimeoutException as e:
             raise NetworkConfigurationError(f"Timeout connecting to switch: {e}")
@@ -131,38 +220,76 @@ class SwitchManager:
         except Exception as e:
             raise NetworkConfigurationError(f"Failed to connect to switch: {e}")
     
-    def _create_vlan(self, device: ConnectHandler, vlan_id: int, vlan_name: str, vlan_description: str) -> bool:
+    def _release_connection(self, device: ConnectHandler, reusable: bool) -> None:
         """
-        Create a VLAN on the switch.
+        Return a switch connection to the pool, or disconnect it.
         
         Args:
             device: Connected netmiko device
+            reusable: Whether the session completed its work cleanly and may be reused
+        """
+        if reusable and SWITCH_IDLE_TIMEOUT > 0:
+            key = self._connection_key()
+            with _connection_pool_lock:
+                if key not in _connection_pool:
+                    _connection_pool[key] = (device, time.monotonic())
+                    return
+        
+        _disconnect(device)
+    
+    def _vlan_commands(self, vlan_id: int, vlan_name: str, vlan_description: str) -> List[str]:
+        """
+        Build the configuration commands that create a VLAN.
+        
+        Args:
             vlan_id: VLAN ID to create
             vlan_name: Name for the VLAN
             vlan_description: Description for the VLAN
             
         Returns:
-            True if successful, False otherwise
+            List of configuration commands
         """
-        try:
-            commands = [
-                f"vlan {vlan_id}",
-                f"name {vlan_name}",
-                f"description {vlan_description}",
-                "exit"
-            ]
-            
-            device.enable()  # Enter privileged mode
-            output = device.send_config_set(commands)
-            device.save_config()  # Save configuration
+        return [
+            f"vlan {vlan_id}",
+            f"name {vlan_name}",
+            f"description {vlan_description}",
+            "exit"
+        ]
+    
+    def _port_assignment_commands(self, ports: List[int], vlan_id: int) -> List[str]:
+        """
+        Build the configuration commands that assign switch ports to a VLAN.
+        
+        Args:
+            ports: List of port numbers to assign
+            vlan_id: VLAN ID to assign ports to
             
-            self.logger.info(f"Created VLAN {vlan_id} ({vlan_name}) on switch")
-            self.logger.debug(f"VLAN creation output: {output}")
-            return True
+        Returns:
+            List of configuration commands
+        """
+        return [
+            _interface_range(tuple(sorted(set(ports)))),
+            "switchport mode access",
+            f"switchport access vlan {vlan_id}",
+            "no shutdown",
+            "exit"
+        ]
+    
+    def _send_config_commands(self, device: ConnectHandler, commands: List[str]) -> str:
+        """
+        Send configuration commands to the switch and save the configuration once.
+        
+        Args:
+            device: Connected netmiko device
+            commands: Configuration commands to send
             
-        except Exception as e:
-            self.logger.error(f"Failed to create VLAN {vlan_id}: {e}")
-            return False
+        Returns:
+            Output of the configuration session
+        """
+        device.enable()  # Enter privileged mode
+        output = device.send_config_set(commands)
+        device.save_config()  # Save configuration
+        return output
     
     def _assign_ports_to_vlan(self, device: ConnectHandler, ports: List[int], vlan_id: int) -> bool:
         """
@@ -177,53 +304,51 @@ class SwitchManager:
             True if successful, False otherwise
         """
         try:
-            # Create interface range command for multiple ports
-            if len(ports) == 1:
-                interface_range = f"interface Twe1/0/{ports[0]}"
-            else:
-                port_ranges = []
-                ports.sort()
-                
-                # Group consecutive ports into ranges
-                start = ports[0]
-                end = ports[0]
-                
-                for port in ports[1:]:
-                    if port == end + 1:
-                        end = port
-                    else:
-                        if start == end:
-                            port_ranges.append(f"Twe1/0/{start}")
-                        else:
-                            port_ranges.append(f"Twe1/0/{start}-{end}")
-                        start = end = port
-                
-                # Add the last range
-                if start == end:
-                    port_ranges.append(f"Twe1/0/{start}")
-                else:
-                    port_ranges.append(f"Twe1/0/{start}-{end}")
-                
-                interface_range = f"interface range {','.join(port_ranges)}"
+            output = self._send_config_commands(device, self._port_assignment_commands(ports, vlan_id))
             
-            commands = [
-                interface_range,
-                "switchport mode access",
-                f"switchport access vlan {vlan_id}",
-                "no shutdown",
-                "exit"
-            ]
+            self.logger.info("Assigned ports %s to VLAN %s", ports, vlan_id)
+            self.logger.debug("Port assignment output: %s", output)
+            return True
             
-            device.enable()  # Enter privileged mode
-            output = device.send_config_set(commands)
-            device.save_config()  # Save configuration
+        except Exception as e:
+            self.logger.error("Failed to assign ports %s to VLAN %s: %s", ports, vlan_id, e)
+            return False
+    
+    def _create_vlan_with_ports(
+        self,
+        device: ConnectHandler,
+        vlan_id: int,
+        vlan_name: str,
+        vlan_description: str,
+        ports: List[int]
+    ) -> bool:
+        """
+        Create a VLAN and assign switch ports to it in one configuration session.
+        
+        Both command sets are sent together and the configuration is saved once,
+        instead of paying a separate config session and save per step.
+        
+        Args:
+            device: Connected netmiko device
+            vlan_id: VLAN ID to create
+            vlan_name: Name for the VLAN
+            vlan_description: Description for the VLAN
+            ports: List of port numbers to assign
             
-            self.logger.info(f"Assigned ports {ports} to VLAN {vlan_id}")
-            self.logger.debug(f"Port assignment output: {output}")
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            commands = self._vlan_commands(vlan_id, vlan_name, vlan_description)
+            commands += self._port_assignment_commands(ports, vlan_id)
+            output = self._send_config_commands(device, commands)
+            
+            self.logger.info("Created VLAN %s (%s) on switch and assigned ports %s", vlan_id, vlan_name, ports)
+            self.logger.debug("VLAN configuration output: %s", output)
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to assign ports {ports} to VLAN {vlan_id}: {e}")
+            self.logger.error("Failed to create VLAN %s with ports %s: %s", vlan_id, ports, e)
             return False
     
     def configure_batch_network(self, resource_names: List[str], user_info: Dict) -> bool:
@@ -260,34 +385,33 @@ class SwitchManager:
             vlan_name = f"{self.config['vlan']['name_prefix']}_{username}_{timestamp}"
             vlan_description = f"{self.config['vlan']['description_prefix']} - User: {username}, Resources: {len(server_ports)}"
             
-            # Connect to switch
-            device = self._connect_to_switch()
-            
-            try:
-                # Create VLAN
-                if not self._create_vlan(device, vlan_id, vlan_name, vlan_description):
-                    return False
+            # Only one switch session is configured at a time
+            with _switch_config_lock:
+                # Connect to switch
+                device = self._connect_to_switch()
+                reusable = False
                 
-                # Assign ports to VLAN
-                ports = list(server_ports.values())
-                if not self._assign_ports_to_vlan(device, ports, vlan_id):
-                    return False
-                
-                self.logger.info(
-                    f"Successfully configured network for batch: "
-                    f"VLAN {vlan_id} with ports {ports} for user {username}"
-                )
-                return True
-                
-            finally:
-                device.disconnect()
-                self.logger.info("Disconnected from switch")
+                try:
+                    # Create VLAN and assign ports to it
+                    ports = list(server_ports.values())
+                    if not self._create_vlan_with_ports(device, vlan_id, vlan_name, vlan_description, ports):
+                        return False
+                    
+                    self.logger.info(
+                        "Successfully configured network for batch: VLAN %s with ports %s for user %s",
+                        vlan_id, ports, username
+                    )
+                    reusable = True
+                    return True
+                    
+                finally:
+                    self._release_connection(device, reusable)
                 
         except NetworkConfigurationError as e:
-            self.logger.error(f"Network configuration error: {e}")
+            self.logger.error("Network configuration error: %s", e)
             return False
         except Exception as e:
-            self.logger.error(f"Unexpected error during network configuration: {e}")
+            self.logger.error("Unexpected error during network configuration: %s", e)
             return False
         
     def restore_port_to_default_vlan(self, resource_name: str) -> bool:
@@ -313,37 +437,89 @@ class SwitchManager:
             # Get port mapping for the resource
             server_ports = self._get_server_ports([resource_name])
             if not server_ports:
-                self.logger.warning(f"No port mapping found for resource: {resource_name}")
+                self.logger.warning("No port mapping found for resource: %s", resource_name)
                 return True
             
             port = server_ports[resource_name]
             default_vlan_id = self.config['vlan']['default_vlan_id']
             
-            # Connect to switch
-            device = self._connect_to_switch()
-            
-            try:
-                # Assign port to default VLAN
-                if not self._assign_ports_to_vlan(device, [port], default_vlan_id):
-                    return False
+            # Only one switch session is configured at a time
+            with _switch_config_lock:
+                # Connect to switch
+                device = self._connect_to_switch()
+                reusable = False
                 
-                self.logger.info(
-                    f"Successfully restored resource '{resource_name}' port {port} to default VLAN {default_vlan_id}"
-                )
-                return True
-                
-            finally:
-                device.disconnect()
-                self.logger.info("Disconnected from switch")
+                try:
+                    # Assign port to default VLAN
+                    if not self._assign_ports_to_vlan(device, [port], default_vlan_id):
+                        return False
+                    
+                    self.logger.info(
+                        "Successfully restored resource '%s' port %s to default VLAN %s",
+                        resource_name, port, default_vlan_id
+                    )
+                    reusable = True
+                    return True
+                    
+                finally:
+                    self._release_connection(device, reusable)
                 
         except NetworkConfigurationError as e:
-            self.logger.error(f"Network configuration error during port restoration: {e}")
+            self.logger.error("Network configuration error during port restoration: %s", e)
             return False
         except Exception as e:
-            self.logger.error(f"Unexpected error during port restoration for '{resource_name}': {e}")
+            self.logger.error("Unexpected error during port restoration for '%s': %s", resource_name, e)
             return False
 
 
+@functools.lru_cache(maxsize=128)
+def _interface_range(ports: Tuple[int, ...]) -> str:
+    """
+    Build the interface (range) command selecting the given switch ports.
+    
+    Args:
+        ports: Sorted, distinct port numbers
+        
+    Returns:
+        Interface command, e.g. 'interface range Twe1/0/1-3,Twe1/0/7'
+    """
+    if len(ports) == 1:
+        return f"interface Twe1/0/{ports[0]}"
+    
+    # Consecutive ports share the same port - index difference
+    port_ranges = []
+    for _, run in itertools.groupby(enumerate(ports), key=lambda item: item[1] - item[0]):
+        run = list(run)
+        start, end = run[0][1], run[-1][1]
+        port_ranges.append(f"Twe1/0/{start}" if start == end else f"Twe1/0/{start}-{end}")
+    
+    return f"interface range {','.join(port_ranges)}"
+
+
+def _disconnect(device: ConnectHandler) -> None:
+    """
+    Disconnect from the switch, logging instead of raising on failure.
+    
+    Args:
+        device: Connected netmiko device
+    """
+    try:
+        device.disconnect()
+        logger.info("Disconnected from switch")
+    except Exception as e:
+        logger.warning("Error while disconnecting from switch: %s", e)
+
+
+def close_switch_connections() -> None:
+    """Disconnect all idle pooled switch sessions."""
+    with _connection_pool_lock:
+        pooled = list(_connection_pool.values())
+        _connection_pool.clear()
+    
+    for device, _ in pooled:
+        _disconnect(device)
+
+
 # Global instance for use in other modules
 _switch_manager = None
 
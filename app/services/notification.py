@@ -4,15 +4,19 @@ Notification service for sending status updates via webhooks.
 This module provides functionality to send notifications about
 BareMetalHost provisioning status to external endpoints.
 """
-import json
+import atexit
+import logging
+import secrets
 from datetime import datetime, timezone
 from typing import Dict, Optional, Any
-import uuid
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .. import config
-from .security import WebhookSecurity
+from .security import get_webhook_security
 
 logger = config.logger
 
@@ -25,16 +29,46 @@ class NotificationError(Exception):
 class NotificationService:
     """Service for sending notifications to external endpoints."""
     
+    # Headers shared by every outgoing request; only the signature varies per call
+    _BASE_HEADERS = {
+        "Content-Type": "application/json",
+        "User-Agent": "polito-reservation-webhook-client/1.0"
+    }
+    
     def __init__(self):
         self.endpoint = config.NOTIFICATION_ENDPOINT
         self.timeout = config.NOTIFICATION_TIMEOUT
         self.log_endpoint = config.WEBHOOK_LOG_ENDPOINT
         self.log_timeout = config.WEBHOOK_LOG_TIMEOUT
-        self.security = WebhookSecurity()  # For generating signatures
+        self.security = get_webhook_security()  # Shared instance, for generating signatures
+        self._sign = self.security._generate_signature
+        self._session = self._create_session()
+        atexit.register(self._session.close)
+    
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """
+        Create the keep-alive HTTP session shared by all outgoing requests.
+        
+        Connection failures and gateway errors are retried a couple of times;
+        POST requests that reached the server are not replayed.
+        
+        Returns:
+            Session with a pooled adapter mounted for HTTP and HTTPS
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
     
     def _generate_event_id(self) -> str:
         """Generate a unique event ID."""
-        return f"event-{uuid.uuid4()}"
+        return "event-" + secrets.token_hex(16)
     
     def _get_current_timestamp(self) -> str:
         """Get current timestamp in ISO format."""
@@ -51,9 +85,9 @@ class NotificationService:
             HMAC signature string or None if no webhook secret is configured
         """
         try:
-            return self.security._generate_signature(payload_bytes)
+            return self._sign(payload_bytes)
         except Exception as e:
-            logger.warning(f"Failed to generate signature: {e}")
+            logger.warning("Failed to generate signature: %s", e)
             return None
     
     def _create_notification_payload(
@@ -150,10 +184,13 @@ class NotificationService:
         Returns:
             Webhook log payload dictionary
         """
+        # One timestamp for the original event and the log metadata
+        timestamp = self._get_current_timestamp()
+        
         # Create the original event payload that would have been sent to our webhook
         original_payload = {
             "eventType": event_type,
-            "timestamp": self._get_current_timestamp(),
+            "timestamp": timestamp,
             "resourceName": resource_name or "unknown",
             "userId": user_id or "unknown"
         }
@@ -165,7 +202,7 @@ class NotificationService:
         log_payload = {
             "webhookId": webhook_id,
             "eventType": event_type,
-            "payload": json.dumps(original_payload, separators=(',', ':')),  # Compact JSON string
+            "payload": orjson.dumps(original_payload).decode('utf-8'),  # Compact JSON string
             "statusCode": status_code,
             "response": response_message,
             "success": success,
@@ -176,7 +213,7 @@ class NotificationService:
         metadata = {
             "resourceType": "BareMetalHost",
             "namespace": config.K8S_NAMESPACE,
-            "timestamp": self._get_current_timestamp()
+            "timestamp": timestamp
         }
         
         if resource_name:
@@ -226,28 +263,24 @@ class NotificationService:
                 webhook_id, user_id, resource_name, event_id, success, error_message
             )
             
-            # Convert payload to JSON bytes for signature generation
-            payload_json = json.dumps(payload, separators=(',', ':'))  # Compact JSON
-            payload_bytes = payload_json.encode('utf-8')
+            # Convert payload to compact JSON bytes for signature generation
+            payload_bytes = orjson.dumps(payload)
             
             # Generate HMAC signature
             signature = self._generate_signature(payload_bytes)
             
             # Prepare headers
-            headers = {
-                "Content-Type": "application/json",
-                "User-Agent": "polito-reservation-webhook-client/1.0",
-                "X-Webhook-Signature": signature
-            }
+            headers = {**self._BASE_HEADERS, "X-Webhook-Signature": signature}
                 
             
             logger.info(
-                f"Sending provisioning notification for resource '{resource_name}' "
-                f"(success: {success}) to {self.endpoint}"
+                "Sending provisioning notification for resource '%s' (success: %s) to %s",
+                resource_name, success, self.endpoint
             )
-            logger.debug(f"Notification payload: {json.dumps(payload, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Notification payload: %s", orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode('utf-8'))
             
-            response = requests.post(
+            response = self._session.post(
                 self.endpoint,
                 data=payload_bytes,  # Use raw bytes to match signature
                 timeout=self.timeout,
@@ -257,28 +290,29 @@ class NotificationService:
             response.raise_for_status()
             
             logger.info(
-                f"Successfully sent notification for resource '{resource_name}' "
-                f"(status: {response.status_code})"
+                "Successfully sent notification for resource '%s' (status: %s)",
+                resource_name, response.status_code
             )
             return True
             
         except requests.exceptions.Timeout:
             logger.error(
-                f"Timeout sending notification for resource '{resource_name}' "
-                f"to {self.endpoint} (timeout: {self.timeout}s)"
+                "Timeout sending notification for resource '%s' to %s (timeout: %ss)",
+                resource_name, self.endpoint, self.timeout
             )
             return False
             
         except requests.exceptions.RequestException as e:
             logger.error(
-                f"Error sending notification for resource '{resource_name}' "
-                f"to {self.endpoint}: {str(e)}"
+                "Error sending notification for resource '%s' to %s: %s",
+                resource_name, self.endpoint, e
             )
             return False
             
         except Exception as e:
             logger.error(
-                f"Unexpected error sending notification for resource '{resource_name}': {str(e)}"
+                "Unexpected error sending notification for resource '%s': %s",
+                resource_name, e
             )
             return False
         
@@ -331,27 +365,23 @@ class NotificationService:
                 event_id=event_id
             )
             
-            # Convert payload to JSON bytes for signature generation
-            payload_json = json.dumps(payload, separators=(',', ':'))  # Compact JSON
-            payload_bytes = payload_json.encode('utf-8')
+            # Convert payload to compact JSON bytes for signature generation
+            payload_bytes = orjson.dumps(payload)
             
             # Generate HMAC signature
             signature = self._generate_signature(payload_bytes)
             
             # Prepare headers
-            headers = {
-                "Content-Type": "application/json",
-                "User-Agent": "polito-reservation-webhook-client/1.0",
-                "X-Webhook-Signature": signature
-            }
+            headers = {**self._BASE_HEADERS, "X-Webhook-Signature": signature}
             
             logger.debug(
-                f"Sending webhook log for event '{event_type}' "
-                f"(success: {success}, resource: {resource_name}) to {self.log_endpoint}"
+                "Sending webhook log for event '%s' (success: %s, resource: %s) to %s",
+                event_type, success, resource_name, self.log_endpoint
             )
-            logger.debug(f"Webhook log payload: {json.dumps(payload, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Webhook log payload: %s", orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode('utf-8'))
             
-            response = requests.post(
+            response = self._session.post(
                 self.log_endpoint,
                 data=payload_bytes,  # Use raw bytes to match signature
                 timeout=self.log_timeout,
@@ -361,31 +391,33 @@ class NotificationService:
             response.raise_for_status()
             
             logger.debug(
-                f"Successfully sent webhook log for event '{event_type}' "
-                f"(status: {response.status_code})"
+                "Successfully sent webhook log for event '%s' (status: %s)",
+                event_type, response.status_code
             )
             return True
             
         except requests.exceptions.Timeout:
             logger.warning(
-                f"Timeout sending webhook log for event '{event_type}' "
-                f"to {self.log_endpoint} (timeout: {self.log_timeout}s)"
+                "Timeout sending webhook log for event '%s' to %s (timeout: %ss)",
+                event_type, self.log_endpoint, self.log_timeout
             )
             return False
             
         except requests.exceptions.RequestException as e:
             logger.warning(
-                f"Error sending webhook log for event '{event_type}' "
-                f"to {self.log_endpoint}: {str(e)}"
+                "Error sending webhook log for event '%s' to %s: %s",
+                event_type, self.log_endpoint, e
             )
             return False
             
         except Exception as e:
             logger.warning(
-                f"Unexpected error sending webhook log for event '{event_type}': {str(e)}"
+                "Unexpected error sending webhook log for event '%s': %s",
+                event_type, e
             )
             return False
 
+
 # Singleton instance
 _notification_service = NotificationService()
 